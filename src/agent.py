@@ -9,11 +9,21 @@ import re
 import os
 import logging
 
+import numpy as np
+
 from a2a.server.tasks import TaskUpdater
 from a2a.types import Message, Part, TextPart
 from a2a.utils import get_message_text
 
-from mcp_client import MCPClient
+from mcp_client import LazyMCPResult, MCPClient
+
+_HONEST_MODEL = "Honest Model"
+
+_ENDPOINT_RE = re.compile(r"http://[^\s]+/sse")
+_GREEN_URL_RE = re.compile(r"https?://([^:/]+)(?::(\d+))?")
+
+# Last answer per MCP endpoint, keyed on a digest of the result table
+_ANSWER_CACHE: dict[str, tuple[bytes, str]] = {}
 
 LIGHT_PURPLE = '\033[95m'
 LIGHT_GREEN = '\033[92m'
@@ -29,9 +39,34 @@ class ColoredFormatter(logging.Formatter):
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
-handler = logging.StreamHandler()
-handler.setFormatter(ColoredFormatter('%(levelname)s: %(message)s'))
-logger.addHandler(handler)
+if not logger.handlers:
+    handler = logging.StreamHandler()
+    handler.setFormatter(ColoredFormatter('%(levelname)s: %(message)s'))
+    logger.addHandler(handler)
+
+
+def _decide(result: LazyMCPResult) -> str:
+    """
+    Decide whether the honest model wins the majority of tasks.
+
+    Args:
+        result: Unparsed task_name, winner query result
+
+    Returns:
+        The final answer text
+    """
+    winners = result.to_frame(["winner"])["winner"].to_numpy()
+    logger.debug("Result rows: %d", winners.size)
+
+    honest_wins = int(np.count_nonzero(winners == _HONEST_MODEL))
+    total = winners.size
+
+    logger.info(f"Honest wins: {honest_wins}, Total tasks: {total}")
+
+    if honest_wins > total / 2:
+        return "FINAL ANSWER: Yes"
+    return "FINAL ANSWER: No"
+
 
 class Agent:
     def __init__(self):
@@ -53,7 +88,7 @@ class Agent:
         def _get_host_port_from_env():
             env_url = os.environ.get("GREEN_AGENT_MCP_URL") # f"http://green-agent:{MCP_PORT}"
             if env_url: # 
-                match = re.match(r"https?://([^:/]+)(?::(\d+))?", env_url)
+                match = _GREEN_URL_RE.match(env_url)
                 if match:
                     host = match.group(1)
                     port = int(match.group(2)) if match.group(2) else 8080
@@ -73,25 +108,24 @@ class Agent:
             try:
                 # Query database via MCP
                 async with MCPClient(mcp_endpoint) as client:
-                    # Get all of the task names and eval ids
-                    df = await client.query_df("SELECT model,task_name,score_headline_value FROM evals")
-                    logger.debug(f"Result DataFrame:\n{df}")
-
-                    grouped_df = df.groupby("task_name")
-                    # for each group, determine which model has the highest score_headline_value
-                    honest_wins = 0
-                    for cnt, (task_name, group) in enumerate(grouped_df):
-                        model = group[group["score_headline_value"] == group["score_headline_value"].max()]["model"].tolist()
-                        if model[0] == 'Honest Model':
-                            honest_wins += 1
-
-                    logger.info(f"Honest wins: {honest_wins}, Total tasks: {cnt}")
-
-                    if honest_wins > cnt / 2:
-                        response = "FINAL ANSWER: Yes"
-                    else:
-                        response = "FINAL ANSWER: No"
-
+                    # Let the database pick each task's highest-scoring model; ties
+                    # go to the first row in table order, as before, and tasks
+                    # without any real score are left out. Rows come back in task
+                    # order so an unchanged table hits the answer cache.
+                    result = await client.query_lazy(
+                        "SELECT task_name, first(model ORDER BY score_headline_value DESC, rowid) AS winner "
+                        "FROM evals WHERE score_headline_value IS NOT NULL AND NOT isnan(score_headline_value) "
+                        "GROUP BY task_name ORDER BY task_name"
+                    )
+
+                # The answer only depends on the query result, so reuse it if unchanged
+                cached = _ANSWER_CACHE.get(mcp_endpoint)
+                if cached and cached[0] == result.digest:
+                    response = cached[1]
+                    logger.info(f"Response (cached): {response}")
+                else:
+                    response = _decide(result)
+                    _ANSWER_CACHE[mcp_endpoint] = (result.digest, response)
                     logger.info(f"Response: {response}")
             except Exception as e:
                 logger.error(f"Error: {e}")
@@ -105,6 +139,6 @@ class Agent:
     def _extract_mcp_endpoint(self, text: str) -> str | None:
         """Extract MCP endpoint URL from prompt text."""
         # Look for SSE endpoint URL pattern
-        match = re.search(r"http://[^\s]+/sse", text)
+        match = _ENDPOINT_RE.search(text)
         return match.group(0) if match else None
 
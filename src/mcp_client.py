@@ -2,16 +2,59 @@
 MCP SSE client for querying the database.
 
 Uses the official MCP SDK SSE client to properly maintain the connection.
+Initialized sessions are pooled per endpoint and reused across requests.
 """
 
+import asyncio
+import csv
+import functools
+import hashlib
+import io
+import itertools
 import re
+import time
+from collections import OrderedDict
 
+import anyio
+import httpx
 import pandas as pd
 from mcp.client.sse import sse_client
 from mcp import ClientSession
 
+# Parsed frames keyed on (columns, table digest), least recently used first
+_PARSE_CACHE_SIZE = 32
+_PARSE_CACHE: OrderedDict[tuple, pd.DataFrame] = OrderedDict()
 
-def _parse_tabulate_to_dataframe(result: str) -> pd.DataFrame:
+# Lines the server adds around the table (warnings, query counts)
+_METADATA_LINE_RE = re.compile(r"^(?:⚠️.*|.*Queries used:.*)\n?", re.MULTILINE)
+
+# Bordered-format lines: +---+ separators, and anything that isn't a | row
+_SEPARATOR_LINE_RE = re.compile(r"^\+.*$", re.MULTILINE)
+_NON_ROW_LINE_RE = re.compile(r"^(?!\|).*\n?", re.MULTILINE)
+
+# Column type annotations that are parsed to numbers rather than left as text
+_NUMERIC_TYPE_RE = re.compile(
+    r"^(?:U?(?:TINY|SMALL|BIG|HUGE)?INT(?:EGER)?|FLOAT|DOUBLE|REAL|(?:DECIMAL|NUMERIC)(?:\(.*\))?)$"
+)
+
+# SSE transport timeouts, and the limit on a single tool call
+_SSE_TIMEOUT = 30.0
+_SSE_READ_TIMEOUT = 60.0
+_CALL_TIMEOUT = 30.0
+
+# Transport failures that mean a tool call never reached the server, so it
+# is safe to retry on a new session
+_RETRYABLE_ERRORS = (anyio.ClosedResourceError, anyio.BrokenResourceError, httpx.TransportError)
+
+# Idle initialized sessions per endpoint, each paired with the task that owns
+# its SSE connection and the time it was returned to the pool. Sessions idle
+# for longer than the SSE read timeout may have a dead stream and are dropped.
+_POOL_SIZE = 4
+_POOLS: dict[str, asyncio.Queue[tuple[ClientSession, asyncio.Task, float]]] = {}
+_BACKGROUND_TASKS: set[asyncio.Task] = set()
+
+
+def _parse_tabulate_to_dataframe(result: str, columns: list[str] | None = None) -> pd.DataFrame:
     """
     Parse tabulate "pretty" format output into a pandas DataFrame.
 
@@ -21,69 +64,119 @@ def _parse_tabulate_to_dataframe(result: str) -> pd.DataFrame:
 
     Args:
         result: The string output from a tabulate-formatted query result
+        columns: Only parse these columns (default: all)
 
     Returns:
         pandas DataFrame with the parsed data
     """
-    lines = result.strip().split("\n")
+    text = result.strip()
+
+    # Detect format: bordered (+---+) vs simple, by looking for any line
+    # starting with "+" in one substring search over the whole text
+    if text.startswith("+") or "\n+" in text:
+        return _parse_bordered_format(text, columns)
 
     # Filter out metadata lines (warnings, query counts)
-    data_lines = []
-    for line in lines:
-        if "Queries used:" in line or line.startswith("⚠️"):
-            continue
-        data_lines.append(line)
+    data_lines = [line for line in _METADATA_LINE_RE.sub("", text).split("\n") if line]
 
     if not data_lines:
         return pd.DataFrame()
 
-    # Detect format: bordered (+---+) vs simple
-    is_bordered = any(line.startswith("+") and "+" in line[1:] for line in data_lines)
-
-    if is_bordered:
-        return _parse_bordered_format(data_lines)
-    else:
-        return _parse_simple_format(data_lines)
+    df = _parse_simple_format(data_lines)
+    return df[columns] if columns is not None else df
 
 
-def _parse_bordered_format(lines: list[str]) -> pd.DataFrame:
+def _split_bordered(text: str) -> tuple[list[str], list[str], str] | None:
     """
-    Parse bordered tabulate format:
+    Split bordered tabulate format into its header and body:
     +---------------+-------+--------+
     | column_name   | col2  | col3   |
     | VARCHAR       | INT   | FLOAT  |
     +---------------+-------+--------+
     | value1        | 10    | 1.5    |
     +---------------+-------+--------+
+
+    Returns:
+        Tuple of (column names, column types, data rows), or None if the
+        text has no header block
     """
-    separator_indices = [i for i, line in enumerate(lines) if line.startswith("+")]
+    separators = list(itertools.islice(_SEPARATOR_LINE_RE.finditer(text), 2))
 
-    if len(separator_indices) < 2:
-        return pd.DataFrame()
+    if len(separators) < 2:
+        return None
 
-    # Header is between first two separators
-    header_start = separator_indices[0] + 1
-    header_end = separator_indices[1]
+    # First line between the first two separators contains column names,
+    # the second (if present) their types
+    header_lines = text[separators[0].end():separators[1].start()].strip("\n").split("\n")
+    columns = [col.strip() for col in header_lines[0].split("|")[1:-1]]
+    types = [""] * len(columns)
+    if len(header_lines) > 1:
+        types = [t.strip() for t in header_lines[1].split("|")[1:-1]]
 
-    # First header line contains column names
-    header_line = lines[header_start]
-    columns = [col.strip() for col in header_line.split("|") if col.strip()]
+    # Data rows follow the second separator; drop separators, metadata and
+    # any other line that isn't a table row in one pass over the text
+    body = _NON_ROW_LINE_RE.sub("", text[separators[1].end():])
+    return columns, types, body
 
-    # Data rows are between second separator and last separator
-    data_start = separator_indices[1] + 1
-    data_end = separator_indices[-1] if len(separator_indices) > 2 else len(lines)
 
-    rows = []
-    for i in range(data_start, data_end):
-        line = lines[i]
-        if line.startswith("+"):
-            continue
-        if "|" in line:
-            values = [val.strip() for val in line.split("|") if val.strip()]
-            if values:
-                rows.append(values)
+def _is_numeric_type(types: list[str], pos: int) -> bool:
+    """Return True if the column at pos is annotated with a numeric type."""
+    return pos < len(types) and bool(_NUMERIC_TYPE_RE.match(types[pos]))
 
-    return pd.DataFrame(rows, columns=columns)
+
+def _parse_bordered_format(text: str, usecols: list[str] | None = None) -> pd.DataFrame:
+    """
+    Parse bordered tabulate format into a pandas DataFrame.
+
+    Columns whose type annotation is numeric (INT, DOUBLE, DECIMAL, ...)
+    are converted to numbers; everything else is returned as strings. If
+    usecols is given, the remaining columns are skipped by the reader.
+    """
+    split = _split_bordered(text)
+    if split is None:
+        return pd.DataFrame()
+    columns, types, body = split
+
+    if usecols is None:
+        positions = list(range(len(columns)))
+    else:
+        missing = [col for col in usecols if col not in columns]
+        if missing:
+            raise KeyError(f"{missing} not in result columns {columns}")
+        positions = sorted(columns.index(col) for col in usecols)
+
+    if not body:
+        return pd.DataFrame({
+            columns[pos]: pd.Series(dtype=float if _is_numeric_type(types, pos) else str)
+            for pos in positions
+        })[usecols if usecols is not None else columns]
+
+    # Let the C parser split the rows straight from the body text, reading
+    # only the requested columns between the border pipes
+    df = pd.read_csv(
+        io.StringIO(body),
+        sep="|",
+        engine="c",
+        header=None,
+        usecols=[pos + 1 for pos in positions],
+        dtype=str,
+        skipinitialspace=True,
+        quoting=csv.QUOTE_NONE,
+        na_filter=False,
+    )
+    df.columns = [columns[pos] for pos in positions]
+    df = df.apply(lambda col: col.str.rstrip())
+
+    for i, pos in enumerate(positions):
+        if _is_numeric_type(types, pos):
+            df.isetitem(i, pd.to_numeric(df.iloc[:, i], errors="coerce"))
+
+    return df[usecols] if usecols is not None else df
+
+
+def _is_dash_line(line: str) -> bool:
+    """Return True if the line is a non-empty run of dashes."""
+    return bool(line) and not line.strip("-")
 
 
 def _parse_simple_format(lines: list[str]) -> pd.DataFrame:
@@ -107,7 +200,7 @@ def _parse_simple_format(lines: list[str]) -> pd.DataFrame:
     # Find the separator line (all dashes)
     data_start = 1
     for i, line in enumerate(lines[1:], start=1):
-        if re.match(r"^-+$", line.strip()):
+        if _is_dash_line(line.strip()):
             data_start = i + 1
             break
         # Skip type annotation lines (e.g., VARCHAR, INT)
@@ -117,12 +210,107 @@ def _parse_simple_format(lines: list[str]) -> pd.DataFrame:
     rows = []
     for line in lines[data_start:]:
         line = line.strip()
-        if line and not re.match(r"^-+$", line):
+        if line and not _is_dash_line(line):
             rows.append([line])
 
     return pd.DataFrame(rows, columns=columns)
 
 
+class LazyMCPResult:
+    """
+    Raw query result whose parsing is deferred until a frame is requested.
+
+    Holding the tabulate text lets callers fingerprint or cache the result
+    without paying for a parse, and parse only the columns they need.
+    Parsed frames are kept in an LRU cache keyed on the table's digest and
+    handed out as copies, so callers may modify them freely. Only to_frame()
+    and query_df() callers benefit from it: the agent answers from its own
+    answer cache first and parses only when the table changed.
+    """
+
+    def __init__(self, text: str):
+        """
+        Args:
+            text: Raw tabulate-formatted query result
+        """
+        self.text = text
+
+    @functools.cached_property
+    def digest(self) -> bytes:
+        """
+        Content fingerprint of the table, ignoring the server's metadata lines.
+
+        The query counter footer changes on every call, so it must not take
+        part in the fingerprint.
+        """
+        table = _METADATA_LINE_RE.sub("", self.text).strip()
+        return hashlib.blake2b(table.encode(), digest_size=16).digest()
+
+    def to_frame(self, columns: list[str] | None = None) -> pd.DataFrame:
+        """
+        Parse the result into a pandas DataFrame.
+
+        Args:
+            columns: Only parse these columns (default: all)
+
+        Returns:
+            pandas DataFrame with the parsed data
+        """
+        key = (tuple(columns) if columns is not None else None, self.digest)
+        if key in _PARSE_CACHE:
+            _PARSE_CACHE.move_to_end(key)
+            return _PARSE_CACHE[key].copy()
+
+        parsed = _parse_tabulate_to_dataframe(self.text, columns)
+        _PARSE_CACHE[key] = parsed
+        if len(_PARSE_CACHE) > _PARSE_CACHE_SIZE:
+            _PARSE_CACHE.popitem(last=False)
+        return parsed.copy()
+
+
+def _spawn(coro) -> asyncio.Task:
+    """Start a background task and keep a reference to it until it finishes."""
+    task = asyncio.create_task(coro)
+    _BACKGROUND_TASKS.add(task)
+    task.add_done_callback(_BACKGROUND_TASKS.discard)
+    return task
+
+
+async def _hold_session(endpoint: str, ready: asyncio.Future) -> None:
+    """
+    Own an SSE connection and its session for their whole lifetime.
+
+    The SDK context managers must be entered and exited by the same task, so
+    each pooled session lives inside its own task until that task is cancelled.
+    """
+    try:
+        async with sse_client(endpoint, timeout=_SSE_TIMEOUT, sse_read_timeout=_SSE_READ_TIMEOUT) as (read_stream, write_stream):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+                ready.set_result(session)
+                await asyncio.Future()
+    except Exception as e:
+        if not ready.done():
+            ready.set_exception(e)
+
+
+async def _open_session(endpoint: str) -> tuple[ClientSession, asyncio.Task]:
+    """Open and initialize a new session, returning it with its owner task."""
+    ready = asyncio.get_running_loop().create_future()
+    owner = _spawn(_hold_session(endpoint, ready))
+    return await ready, owner
+
+
+async def _warm_pool(endpoint: str, count: int) -> None:
+    """Eagerly fill an endpoint's pool with initialized sessions."""
+    results = await asyncio.gather(
+        *(_open_session(endpoint) for _ in range(count)), return_exceptions=True
+    )
+    for result in results:
+        if not isinstance(result, BaseException):
+            _POOLS[endpoint].put_nowait((*result, time.monotonic()))
+
+
 class MCPClient:
     """MCP client using official SDK SSE transport."""
 
@@ -135,35 +323,38 @@ class MCPClient:
         """
         self.endpoint = endpoint
         self._session = None
-        self._sse_context = None
-        self._session_context = None
+        self._owner = None
 
     async def __aenter__(self):
-        # Create SSE client context
-        self._sse_context = sse_client(self.endpoint, timeout=30.0, sse_read_timeout=60.0)
-        read_stream, write_stream = await self._sse_context.__aenter__()
-
-        # Create and initialize session
-        self._session_context = ClientSession(read_stream, write_stream)
-        self._session = await self._session_context.__aenter__()
-        await self._session.initialize()
+        pool = _POOLS.get(self.endpoint)
+        if pool is None:
+            pool = _POOLS[self.endpoint] = asyncio.Queue()
+            _spawn(_warm_pool(self.endpoint, _POOL_SIZE - 1))
+
+        # Reuse an idle session whose connection is still alive
+        while not pool.empty():
+            self._session, self._owner, idle_since = pool.get_nowait()
+            if not self._owner.done() and time.monotonic() - idle_since < _SSE_READ_TIMEOUT:
+                break
+            self._owner.cancel()
+        else:
+            self._session, self._owner = await _open_session(self.endpoint)
 
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        # Close session first
-        if self._session_context:
-            try:
-                await self._session_context.__aexit__(exc_type, exc_val, exc_tb)
-            except Exception:
-                pass
-
-        # Then close SSE connection
-        if self._sse_context:
-            try:
-                await self._sse_context.__aexit__(exc_type, exc_val, exc_tb)
-            except Exception:
-                pass
+        if self._owner is None:
+            return
+
+        # Return healthy sessions to the pool; drop the rest
+        pool = _POOLS[self.endpoint]
+        if exc_type is None and not self._owner.done() and pool.qsize() < _POOL_SIZE:
+            pool.put_nowait((self._session, self._owner, time.monotonic()))
+        else:
+            self._owner.cancel()
+
+        self._session = None
+        self._owner = None
 
     async def query(self, sql: str) -> str:
         """
@@ -174,19 +365,46 @@ class MCPClient:
 
         Returns:
             Query result as string
+
+        Raises:
+            Exception: If the query tool reports an error
         """
-        result = await self._session.call_tool("query", {"query": sql})
+        try:
+            result = await asyncio.wait_for(
+                self._session.call_tool("query", {"query": sql}), _CALL_TIMEOUT
+            )
+        except _RETRYABLE_ERRORS:
+            # A pooled session's stream can die without its owner task
+            # noticing; retry once on a freshly opened session. Timeouts and
+            # tool errors may have reached the server and are not retried.
+            self._owner.cancel()
+            self._session, self._owner = await _open_session(self.endpoint)
+            result = await asyncio.wait_for(
+                self._session.call_tool("query", {"query": sql}), _CALL_TIMEOUT
+            )
 
         # Extract text from result content
+        texts = [t for t in (getattr(item, "text", None) for item in result.content or []) if t is not None]
+        if result.isError:
+            raise Exception(f"MCP query failed: {' '.join(texts)}")
+
         if result.content:
-            texts = []
-            for item in result.content:
-                if hasattr(item, "text"):
-                    texts.append(item.text)
             return "\n".join(texts) if texts else str(result.content)
 
         return "No result returned"
 
+    async def query_lazy(self, sql: str) -> LazyMCPResult:
+        """
+        Execute SQL query via MCP and return the result unparsed.
+
+        Args:
+            sql: SQL query to execute
+
+        Returns:
+            LazyMCPResult wrapping the raw query result
+        """
+        return LazyMCPResult(await self.query(sql))
+
     async def query_df(self, sql: str) -> pd.DataFrame:
         """
         Execute SQL query via MCP and return result as a pandas DataFrame.
@@ -197,5 +415,5 @@ class MCPClient:
         Returns:
             Query result as pandas DataFrame
         """
-        result = await self.query(sql)
-        return _parse_tabulate_to_dataframe(result)
+        result = await self.query_lazy(sql)
+        return result.to_frame()
@@ -0,0 +1,258 @@
+import asyncio
+from types import SimpleNamespace
+
+import anyio
+import numpy as np
+import pytest
+
+import mcp_client
+from mcp_client import LazyMCPResult, MCPClient, _parse_tabulate_to_dataframe
+
+
+BORDERED = """\
+⚠️ Query budget is limited
++--------------+-----------+----------------------+
+| model        | task_name | score_headline_value |
+| VARCHAR      | VARCHAR   | DOUBLE               |
++--------------+-----------+----------------------+
+| Honest Model | task_a    | 0.75                 |
+|    Sandbagger|  task_a   |        0.5           |
+|   centered   | task_b    | NULL                 |
+| Honest Model |           | 1                    |
++--------------+-----------+----------------------+
+Queries used: 3/10
+"""
+
+EMPTY_BODY = """\
++-------+----------------------+
+| model | score_headline_value |
+| VARCHAR | DOUBLE             |
++-------+----------------------+
++-------+----------------------+
+"""
+
+SIMPLE = """\
+model
+VARCHAR
+------------
+Honest Model
+Sandbagger
+Queries used: 1/10
+"""
+
+
+# Parser tests
+
+def test_bordered_parses_strings_and_numbers():
+    df = _parse_tabulate_to_dataframe(BORDERED)
+
+    assert list(df.columns) == ["model", "task_name", "score_headline_value"]
+    assert df["model"].tolist() == ["Honest Model", "Sandbagger", "centered", "Honest Model"]
+    assert df["task_name"].tolist() == ["task_a", "task_a", "task_b", ""]
+    assert df["score_headline_value"].dtype == np.float64
+
+
+def test_bordered_null_in_double_column_is_nan():
+    scores = _parse_tabulate_to_dataframe(BORDERED)["score_headline_value"]
+
+    assert scores.tolist()[:2] == [0.75, 0.5]
+    assert np.isnan(scores[2])
+    assert scores[3] == 1.0
+
+
+def test_bordered_ignores_metadata_lines():
+    df = _parse_tabulate_to_dataframe(BORDERED)
+
+    assert len(df) == 4
+    assert not df["model"].str.contains("Queries used|⚠️").any()
+
+
+def test_bordered_empty_body_keeps_typed_columns():
+    df = _parse_tabulate_to_dataframe(EMPTY_BODY)
+
+    assert df.empty
+    assert list(df.columns) == ["model", "score_headline_value"]
+    assert df["score_headline_value"].dtype == np.float64
+
+
+def test_bordered_selected_columns():
+    df = _parse_tabulate_to_dataframe(BORDERED, ["score_headline_value", "model"])
+
+    assert list(df.columns) == ["score_headline_value", "model"]
+
+
+def test_bordered_missing_column_raises_key_error():
+    with pytest.raises(KeyError):
+        _parse_tabulate_to_dataframe(BORDERED, ["winner"])
+
+
+def test_simple_format():
+    df = _parse_tabulate_to_dataframe(SIMPLE)
+
+    assert df["model"].tolist() == ["Honest Model", "Sandbagger"]
+
+
+# LazyMCPResult tests
+
+def test_digest_ignores_query_counter():
+    first = LazyMCPResult(BORDERED)
+    second = LazyMCPResult(BORDERED.replace("Queries used: 3/10", "Queries used: 4/10"))
+
+    assert first.digest == second.digest
+    assert first.digest != LazyMCPResult(EMPTY_BODY).digest
+
+
+def test_to_frame_returns_independent_copies():
+    first = LazyMCPResult(BORDERED).to_frame()
+    first.loc[0, "model"] = "overwritten"
+    first["task_name"] = "overwritten"
+
+    second = LazyMCPResult(BORDERED).to_frame()
+    assert second.loc[0, "model"] == "Honest Model"
+    assert second.loc[0, "task_name"] == "task_a"
+
+
+# Session pool tests
+
+TABLE = "model\nVARCHAR\n---\nHonest Model"
+
+
+class FakeMCP:
+    """Stands in for the SDK's sse_client and ClientSession."""
+
+    def __init__(self):
+        self.sessions = []
+        self.calls = 0
+        self.failures = 0
+        self.hang = False
+        self.is_error = False
+
+    def sse_client(self, endpoint, timeout, sse_read_timeout):
+        class _Context:
+            async def __aenter__(self):
+                return None, None
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Context()
+
+    def session(self, read_stream, write_stream):
+        fake = self
+
+        class _Session:
+            async def __aenter__(self):
+                fake.sessions.append(self)
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            async def initialize(self):
+                pass
+
+            async def call_tool(self, name, arguments):
+                fake.calls += 1
+                if fake.hang:
+                    await asyncio.Future()
+                if fake.failures:
+                    fake.failures -= 1
+                    raise anyio.ClosedResourceError
+                return SimpleNamespace(
+                    isError=fake.is_error,
+                    content=[SimpleNamespace(text="boom" if fake.is_error else TABLE)],
+                )
+
+        return _Session()
+
+
+@pytest.fixture
+def fake_mcp(monkeypatch):
+    fake = FakeMCP()
+    monkeypatch.setattr(mcp_client, "sse_client", fake.sse_client)
+    monkeypatch.setattr(mcp_client, "ClientSession", fake.session)
+    monkeypatch.setattr(mcp_client, "_POOL_SIZE", 1)
+    monkeypatch.setattr(mcp_client, "_POOLS", {})
+    return fake
+
+
+ENDPOINT = "http://mcp.test/sse"
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_session(fake_mcp):
+    for _ in range(3):
+        async with MCPClient(ENDPOINT) as client:
+            assert (await client.query_df("SELECT model FROM evals"))["model"].tolist() == ["Honest Model"]
+
+    assert len(fake_mcp.sessions) == 1
+
+
+@pytest.mark.asyncio
+async def test_pool_discards_session_on_error(fake_mcp):
+    with pytest.raises(RuntimeError):
+        async with MCPClient(ENDPOINT) as client:
+            raise RuntimeError("request failed")
+    await asyncio.sleep(0)
+
+    async with MCPClient(ENDPOINT) as client:
+        await client.query("SELECT 1")
+
+    assert len(fake_mcp.sessions) == 2
+
+
+@pytest.mark.asyncio
+async def test_pool_skips_dead_owner(fake_mcp):
+    async with MCPClient(ENDPOINT) as client:
+        owner = client._owner
+    owner.cancel()
+    await asyncio.sleep(0)
+
+    async with MCPClient(ENDPOINT) as client:
+        assert client._owner is not owner
+
+    assert len(fake_mcp.sessions) == 2
+
+
+@pytest.mark.asyncio
+async def test_pool_evicts_idle_session(fake_mcp, monkeypatch):
+    async with MCPClient(ENDPOINT):
+        pass
+    monkeypatch.setattr(mcp_client, "_SSE_READ_TIMEOUT", 0.0)
+
+    async with MCPClient(ENDPOINT):
+        pass
+
+    assert len(fake_mcp.sessions) == 2
+
+
+@pytest.mark.asyncio
+async def test_query_retries_once_on_closed_stream(fake_mcp):
+    fake_mcp.failures = 1
+
+    async with MCPClient(ENDPOINT) as client:
+        assert "Honest Model" in await client.query("SELECT model FROM evals")
+
+    assert len(fake_mcp.sessions) == 2
+
+
+@pytest.mark.asyncio
+async def test_query_does_not_retry_timeout(fake_mcp, monkeypatch):
+    fake_mcp.hang = True
+    monkeypatch.setattr(mcp_client, "_CALL_TIMEOUT", 0.01)
+
+    with pytest.raises(asyncio.TimeoutError):
+        async with MCPClient(ENDPOINT) as client:
+            await client.query("SELECT model FROM evals")
+
+    assert fake_mcp.calls == 1
+    assert len(fake_mcp.sessions) == 1
+
+
+@pytest.mark.asyncio
+async def test_query_raises_on_tool_error(fake_mcp):
+    fake_mcp.is_error = True
+
+    with pytest.raises(Exception, match="boom"):
+        async with MCPClient(ENDPOINT) as client:
+            await client.query("SELECT model FROM evals")